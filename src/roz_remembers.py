@@ -1,12 +1,263 @@
 import asyncio
+import functools
 import json
 import logging
-from typing import Any, Dict, Optional
+import math
+from dataclasses import dataclass, fields
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 import copy
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+PathParts = Tuple[Tuple[str, Optional[int]], ...]
+
+def _parse_path(path: str) -> PathParts:
+    """
+    Splits a dotted path into (key, index) pairs. `index` is the segment as an
+    int when it is all digits (usable against a list), otherwise None; `key`
+    is always the raw segment, used against dicts.
+    """
+    return tuple(
+        (part, int(part) if part.isdecimal() else None)
+        for part in path.split('.')
+    )
+
+# Action paths repeat heavily, so their parsing is cached
+_split_path = functools.lru_cache(maxsize=1024)(_parse_path)
+
+def _join_path(parts: PathParts) -> str:
+    return '.'.join(key for key, _ in parts)
+
+class _PathIndexNode:
+    """
+    A node of the trie behind RozRemembers' path index. Children are keyed by
+    segment, with list indices normalised to int so that e.g. "1" and "01"
+    share a node; `paths` holds the raw cached paths that end here.
+    """
+    __slots__ = ('children', 'paths')
+
+    def __init__(self):
+        self.children: Dict[Any, '_PathIndexNode'] = {}
+        self.paths: set = set()
+
+def _fast_clone(value: Any) -> Any:
+    """
+    Deep-copies JSON-shaped data with an orjson round trip, which skips the
+    per-node dispatch and memo bookkeeping of copy.deepcopy. Anything orjson
+    cannot serialise, or a missing orjson, falls back to copy.deepcopy. Only
+    values _is_strict_json accepts are guaranteed to come back unchanged.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(orjson.dumps(
+                value,
+                option=(orjson.OPT_PASSTHROUGH_DATETIME
+                        | orjson.OPT_PASSTHROUGH_DATACLASS
+                        | orjson.OPT_PASSTHROUGH_SUBCLASS),
+            ))
+        except orjson.JSONEncodeError:
+            pass
+    return copy.deepcopy(value)
+
+def _is_strict_json(value: Any) -> bool:
+    """
+    True if `value` is built only from exact dicts with str keys, lists, str,
+    int, bool, None and finite floats, the values _fast_clone reproduces
+    exactly. Tuples, subclasses, UUIDs, enums and NaN/Infinity do not qualify.
+    """
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        node_type = type(node)
+        if node_type is dict:
+            for key in node:
+                if type(key) is not str:
+                    return False
+            stack.extend(node.values())
+        elif node_type is list:
+            stack.extend(node)
+        elif node_type is float:
+            if not math.isfinite(node):
+                return False
+        elif node is not None and node_type not in (str, int, bool):
+            return False
+    return True
+
+def _cow_wrap(value: Any) -> Any:
+    if type(value) is dict:
+        return CopyOnWriteDict(value)
+    if type(value) is list:
+        return CopyOnWriteList(value)
+    return value
+
+class CopyOnWriteDict(dict):
+    """
+    A writable view over a piece of state. Creating one only copies the top
+    level; nested dicts and lists are wrapped the first time they are read,
+    so writes made through the view never reach the state it was built from.
+    """
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        wrapped = _cow_wrap(value)
+        if wrapped is not value:
+            dict.__setitem__(self, key, wrapped)
+        return wrapped
+
+    def __iter__(self):
+        # Overriding __iter__ keeps dict(view) and {**view} off the C fast path,
+        # which would otherwise hand out the unwrapped nested containers.
+        return dict.__iter__(self)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        dict.__setitem__(self, key, default)
+        return default
+
+    def pop(self, key, *default):
+        return _cow_wrap(dict.pop(self, key, *default))
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        return key, _cow_wrap(value)
+
+    def values(self):
+        self._wrap_all()
+        return dict.values(self)
+
+    def items(self):
+        self._wrap_all()
+        return dict.items(self)
+
+    def copy(self):
+        return CopyOnWriteDict(self)
+
+    # dict's | would copy the raw storage, nested containers included
+    def __or__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        merged = CopyOnWriteDict(self)
+        merged.update(other)
+        return merged
+
+    def __ror__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        merged = CopyOnWriteDict(other)
+        merged.update(self)
+        return merged
+
+    def _wrap_all(self):
+        for key in self:
+            self[key]
+
+class CopyOnWriteList(list):
+    """
+    The list counterpart of CopyOnWriteDict.
+    """
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CopyOnWriteList(list.__getitem__(self, index))
+        value = list.__getitem__(self, index)
+        wrapped = _cow_wrap(value)
+        if wrapped is not value:
+            list.__setitem__(self, index, wrapped)
+        return wrapped
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __reversed__(self):
+        for i in reversed(range(len(self))):
+            yield self[i]
+
+    def pop(self, index=-1):
+        return _cow_wrap(list.pop(self, index))
+
+    def copy(self):
+        return CopyOnWriteList(self)
+
+    # list's +, * build their results from the raw items, nested containers
+    # included, so the results are wrapped like slices are
+    def __add__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        return CopyOnWriteList(list.__add__(list(self), other))
+
+    def __radd__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        return CopyOnWriteList(list.__add__(other, list(self)))
+
+    def __mul__(self, count):
+        return CopyOnWriteList(list.__mul__(self, count))
+
+    __rmul__ = __mul__
+
+class _FrozenSlotsState:
+    """
+    The __getstate__/__setstate__ pair dataclass(slots=True) generates on 3.10+.
+    Without it, copying or unpickling a frozen dataclass with __slots__ fails,
+    because restoring slot state goes through the frozen __setattr__.
+    """
+    __slots__ = ()
+
+    def __getstate__(self):
+        return [getattr(self, field.name) for field in fields(self)]
+
+    def __setstate__(self, state):
+        for field, value in zip(fields(self), state):
+            object.__setattr__(self, field.name, value)
+
+@dataclass(frozen=True)
+class StateChangedEvent(_FrozenSlotsState):
+    """
+    Published once per applied SET_STATE. `action_source` is a read-only view
+    of the dispatched action.
+    """
+    __slots__ = ('type', 'path', 'old_value', 'new_value', 'action_source')
+
+    type: str
+    path: str
+    old_value: Any
+    new_value: Any
+    action_source: Mapping[str, Any]
+
+    def __post_init__(self):
+        if not isinstance(self.action_source, MappingProxyType):
+            object.__setattr__(self, 'action_source', MappingProxyType(self.action_source))
+
+    def __reduce__(self):
+        # A mappingproxy cannot be pickled or deep-copied, so the event is
+        # rebuilt from a plain dict, which __post_init__ wraps again.
+        return (type(self), (self.type, self.path, self.old_value, self.new_value, dict(self.action_source)))
+
+@dataclass(frozen=True)
+class StateChangedBatchEvent(_FrozenSlotsState):
+    """
+    Published by the collecting flush policies in place of the individual
+    StateChangedEvents, which it holds in order.
+    """
+    __slots__ = ('type', 'events')
+
+    type: str
+    events: List[StateChangedEvent]
+
 class RozRemembers:
     """
     A generic, message-driven state management library inspired by Redux.
@@ -16,30 +267,93 @@ class RozRemembers:
     """
     ACTION_TYPE_SET_STATE = 'SET_STATE'
     EVENT_TYPE_STATE_CHANGED = 'STATE_CHANGED'
+    EVENT_TYPE_STATE_CHANGED_BATCH = 'STATE_CHANGED_BATCH'
+
+    # How STATE_CHANGED events reach the event queue: one by one as actions are
+    # applied, or collected into a single STATE_CHANGED_BATCH event that is
+    # published on the next loop iteration or after event_flush_delay seconds.
+    EVENT_FLUSH_IMMEDIATE = 'immediate'
+    EVENT_FLUSH_MICROTASK = 'microtask'
+    EVENT_FLUSH_TIMER = 'timer'
+
+    _PATH_INDEX_SIZE = 1024
+
+    def __init__(self, initial_state_file_path: str, max_batch: int = 100, copy_on_write: bool = True, action_queue_maxsize: int = 0,
+                 event_flush_policy: str = EVENT_FLUSH_IMMEDIATE, event_flush_delay: float = 0.016):
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be at least 1, got {max_batch}")
+        if event_flush_policy not in (self.EVENT_FLUSH_IMMEDIATE, self.EVENT_FLUSH_MICROTASK, self.EVENT_FLUSH_TIMER):
+            raise ValueError(f"Unknown event_flush_policy: {event_flush_policy}")
 
-    def __init__(self, initial_state_file_path: str):
         self._initial_state_file_path = initial_state_file_path
         self._state: Dict[str, Any] = {}
+        self._path_index: Dict[str, Any] = {}
+        self._path_index_root = _PathIndexNode()
+        self._copy_on_write = copy_on_write
+        # Cleared once the state may hold anything beyond strict JSON (tuples,
+        # UUIDs, subclasses, NaN/Infinity), which _fast_clone would not bring
+        # back unchanged; plain copies then go through copy.deepcopy.
+        self._json_clone_safe = True
         
-        self._action_queue = asyncio.Queue()
+        self._max_batch = max_batch
+        # A maxsize of 0 leaves the queue unbounded; otherwise dispatch waits
+        # for room once the processor falls that far behind.
+        self._action_queue = asyncio.Queue(maxsize=action_queue_maxsize)
+        self._pending_put: Optional[asyncio.Future] = None
+        self._dispatched: Optional[asyncio.Future] = None
         self._event_queue = asyncio.Queue()
+
+        self._event_flush_policy = event_flush_policy
+        self._event_flush_delay = event_flush_delay
+        self._pending_events: List[StateChangedEvent] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
         
         self._processing_task: Optional[asyncio.Task] = None
 
+        # Each handler takes (action, state, owned, events) and returns the
+        # state after applying the action; see _handle_set_state.
+        self._handlers = {
+            self.ACTION_TYPE_SET_STATE: self._handle_set_state,
+        }
+
     async def load_initial_state(self):
         try:
-            with open(self._initial_state_file_path, 'r') as f:
-                self._state = json.load(f)
-            logger.info(f"Initial state loaded successfully from: {self._initial_state_file_path}")
+            # Reading and parsing a large file would block the event loop
+            self._state, self._json_clone_safe = await asyncio.to_thread(self._read_and_parse, self._initial_state_file_path)
+            logger.info("Initial state loaded successfully from: %s", self._initial_state_file_path)
         except FileNotFoundError:
-            logger.warning(f"Initial state file not found: {self._initial_state_file_path}. Starting with an empty state.")
+            logger.warning("Initial state file not found: %s. Starting with an empty state.", self._initial_state_file_path)
             self._state = {}
+            self._json_clone_safe = True
         except json.JSONDecodeError:
-            logger.error(f"Invalid JSON in initial state file: {self._initial_state_file_path}. Starting with an empty state.")
+            logger.error("Invalid JSON in initial state file: %s. Starting with an empty state.", self._initial_state_file_path)
             self._state = {}
+            self._json_clone_safe = True
         except Exception as e:
-            logger.error(f"Unexpected error loading initial state: {e}", exc_info=True)
+            logger.error("Unexpected error loading initial state: %s", e, exc_info=True)
             self._state = {}
+            self._json_clone_safe = True
+        finally:
+            self._clear_path_index()
+
+    @staticmethod
+    def _read_and_parse(path: str) -> Tuple[Any, bool]:
+        """
+        Returns the parsed file and whether it was strict JSON. Only orjson
+        output counts as strict; the stdlib parser also accepts NaN/Infinity.
+        """
+        if orjson is None:
+            with open(path, 'r') as f:
+                return json.load(f), False
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        try:
+            return orjson.loads(data), True
+        except orjson.JSONDecodeError:
+            # orjson is stricter than json (e.g. no NaN/Infinity), so give the
+            # stdlib parser a chance before reporting the file as invalid.
+            return json.loads(data), False
 
     def start_processing(self):
         if self._processing_task is None or self._processing_task.done():
@@ -57,66 +371,183 @@ class RozRemembers:
                 pass
             logger.info("RozRemembers action processor stopped.")
 
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_events()
+
     async def _action_processor(self):
         logger.info("Action processor is running, waiting for actions...")
         while True:
             try:
-                action = await self._action_queue.get()
-                logger.debug(f"Processing action: {action}")
-                
-                new_state = self._state
-                action_type = action.get('type')
-
-                if action_type == self.ACTION_TYPE_SET_STATE:
-                    path = action.get('path')
-                    value = action.get('value')
-                    
-                    if path is None:
-                        logger.warning(f"SET_STATE action missing 'path': {action}")
-                        self._action_queue.task_done()
-                        continue
-
-                    old_value_at_path = self._get_nested_value(path, current_data=self._state)
-                    
-                    temp_state = copy.deepcopy(self._state) 
-                    
-                    applied_successfully = self._set_nested_value(path, value, current_data=temp_state)
-
-                    if applied_successfully:
-                        self._state = temp_state
-                        
-                        await self._event_queue.put({
-                            'type': self.EVENT_TYPE_STATE_CHANGED,
-                            'path': path,
-                            'old_value': old_value_at_path,
-                            'new_value': self._get_nested_value(path, current_data=self._state),
-                            'action_source': action
-                        })
-                        logger.debug(f"State updated for path '{path}'. Emitted {self.EVENT_TYPE_STATE_CHANGED} event.")
-                    else:
-                        logger.warning(f"Failed to apply state change for path '{path}' with value '{value}'.")
-                else:
-                    logger.warning(f"Unknown action type received: {action_type}. Action: {action}")
-                
-                self._action_queue.task_done()
+                batch = [await self._action_queue.get()]
+                while len(batch) < self._max_batch and not self._action_queue.empty():
+                    batch.append(self._action_queue.get_nowait())
+
+                # Containers copied while applying this batch are only reachable
+                # from the new state, so later actions in the batch can write to
+                # them in place instead of copying the same path again. Holding
+                # the containers here also keeps their ids from being reused.
+                owned: Dict[int, Any] = {}
+                events = []
+                state = self._state
+                for action in batch:
+                    try:
+                        state = self._apply_action(action, state, owned, events)
+                    except Exception as e:
+                        logger.error("Unhandled exception in action processor: %s", e, exc_info=True)
+                self._state = state
+                self._invalidate_path_index([event.path for event in events])
+
+                self._emit_events(events)
+
+                for _ in batch:
+                    self._action_queue.task_done()
 
             except asyncio.CancelledError:
                 logger.info("Action processor task cancelled.")
                 break
-            except Exception as e:
-                logger.error(f"Unhandled exception in action processor: {e}", exc_info=True)
-                self._action_queue.task_done()
 
-    def _get_nested_value(self, path: str, current_data: Dict[str, Any]) -> Any:
-        parts = path.split('.')
+    def _emit_events(self, events: List[StateChangedEvent]):
+        if self._event_flush_policy == self.EVENT_FLUSH_IMMEDIATE:
+            for event in events:
+                self._event_queue.put_nowait(event)
+            return
+
+        self._pending_events.extend(events)
+        if self._flush_handle is None and self._pending_events:
+            loop = asyncio.get_running_loop()
+            if self._event_flush_policy == self.EVENT_FLUSH_MICROTASK:
+                self._flush_handle = loop.call_soon(self._flush_events)
+            else:
+                self._flush_handle = loop.call_later(self._event_flush_delay, self._flush_events)
+
+    def _flush_events(self):
+        self._flush_handle = None
+        if not self._pending_events:
+            return
+        events, self._pending_events = self._pending_events, []
+        self._event_queue.put_nowait(StateChangedBatchEvent(
+            type=self.EVENT_TYPE_STATE_CHANGED_BATCH,
+            events=events
+        ))
+        logger.debug("Emitted %s event with %s changes.", self.EVENT_TYPE_STATE_CHANGED_BATCH, len(events))
+
+    def _apply_action(self, action: Dict[str, Any], state: Dict[str, Any], owned: Dict[int, Any], events: List[StateChangedEvent]) -> Dict[str, Any]:
+        logger.debug("Processing action: %s", action)
+
+        action_type = action.get('type')
+        handler = self._handlers.get(action_type)
+        if handler is None:
+            logger.warning("Unknown action type received: %s. Action: %s", action_type, action)
+            return state
+        return handler(action, state, owned, events)
+
+    def _handle_set_state(self, action: Dict[str, Any], state: Dict[str, Any], owned: Dict[int, Any], events: List[StateChangedEvent]) -> Dict[str, Any]:
+        path = action.get('path')
+        value = action.get('value')
+
+        if path is None:
+            logger.warning("SET_STATE action missing 'path': %s", action)
+            return state
+
+        if not self._copy_on_write and self._json_clone_safe and not _is_strict_json(value):
+            self._json_clone_safe = False
+
+        parts = _split_path(path)
+        old_value_at_path = self._get_nested_value(parts, current_data=state)
+
+        new_state = self._set_nested_value_cow(parts, value, root=state, owned=owned)
+
+        if new_state is None:
+            logger.warning("Failed to apply state change for path '%s' with value '%s'.", path, value)
+            return state
+
+        events.append(StateChangedEvent(
+            type=self.EVENT_TYPE_STATE_CHANGED,
+            path=path,
+            old_value=old_value_at_path,
+            # The value is stored as given, so it is the new value at path.
+            new_value=value,
+            action_source=MappingProxyType(action)
+        ))
+        logger.debug("State updated for path '%s'. Emitted %s event.", path, self.EVENT_TYPE_STATE_CHANGED)
+        return new_state
+
+    def _invalidate_path_index(self, written_paths: List[str]):
+        """
+        Drops the cached lookups that a write to any of `written_paths` may have
+        changed: the written paths themselves, their ancestors and everything
+        below them. Each write costs a walk down its own path plus the entries
+        removed, however large the index is.
+        """
+        if not self._path_index or not written_paths:
+            return
+        for path in written_paths:
+            self._invalidate_indexed_path(_split_path(path))
+
+    def _invalidate_indexed_path(self, parts: PathParts):
+        node = self._path_index_root
+        trail = []
+        for key, index in parts:
+            # Entries on the way down are ancestors of the written path
+            self._drop_indexed_paths(node)
+            segment = key if index is None else index
+            child = node.children.get(segment)
+            if child is None:
+                break
+            trail.append((node, segment))
+            node = child
+        else:
+            # The written path's own node and everything below it are stale
+            parent, segment = trail[-1]
+            del parent.children[segment]
+            stack = [node]
+            while stack:
+                node = stack.pop()
+                self._drop_indexed_paths(node)
+                stack.extend(node.children.values())
+
+        # Prune nodes left without entries or children
+        for parent, segment in reversed(trail):
+            child = parent.children.get(segment)
+            if child is not None and (child.paths or child.children):
+                break
+            parent.children.pop(segment, None)
+
+    def _drop_indexed_paths(self, node: _PathIndexNode):
+        for path in node.paths:
+            del self._path_index[path]
+        node.paths.clear()
+
+    def _index_path(self, path: str, parts: PathParts, value: Any):
+        if len(self._path_index) >= self._PATH_INDEX_SIZE:
+            self._clear_path_index()
+        node = self._path_index_root
+        for key, index in parts:
+            segment = key if index is None else index
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = _PathIndexNode()
+            node = child
+        node.paths.add(path)
+        self._path_index[path] = value
+
+    def _clear_path_index(self):
+        self._path_index.clear()
+        self._path_index_root = _PathIndexNode()
+
+    def _get_nested_value(self, parts: PathParts, current_data: Dict[str, Any]) -> Any:
+        # Top-level keys are the most common target; skip the generic walk.
+        if len(parts) == 1 and isinstance(current_data, dict):
+            return current_data.get(parts[0][0])
+
         temp_data = current_data
-        for part in parts:
+        for key, index in parts:
             if isinstance(temp_data, dict):
-                temp_data = temp_data.get(part)
-            elif isinstance(temp_data, list) and part.isdigit():
-                idx = int(part)
-                if 0 <= idx < len(temp_data):
-                    temp_data = temp_data[idx]
+                temp_data = temp_data.get(key)
+            elif isinstance(temp_data, list) and index is not None:
+                if index < len(temp_data):
+                    temp_data = temp_data[index]
                 else:
                     return None
             else:
@@ -125,49 +556,179 @@ class RozRemembers:
                 break
         return temp_data
 
-    def _set_nested_value(self, path: str, value: Any, current_data: Dict[str, Any]) -> bool:
-        parts = path.split('.')
-        temp_data = current_data
-        
-        for i, part in enumerate(parts):
+    def _set_nested_value_cow(self, parts: PathParts, value: Any, root: Dict[str, Any], owned: Optional[Dict[int, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Returns a new root with `value` stored at the path made of `parts`
+        (see _split_path), leaving `root` untouched. Only the containers along
+        the path are copied; every other subtree is shared by reference with
+        `root`. Returns None if the path cannot be set.
+
+        Containers found in `owned` (keyed by id) are updated in place rather
+        than copied, and every copy made is added to it.
+        """
+        new_root = self._copy_container(root, owned)
+        if new_root is None:
+            logger.warning("Cannot set value on non-container state root for path: %s", _join_path(parts))
+            return None
+
+        if len(parts) == 1 and isinstance(new_root, dict):
+            new_root[parts[0][0]] = value
+            return new_root
+
+        temp_data = new_root
+
+        for i, (key, index) in enumerate(parts):
+            if isinstance(temp_data, list) and index is not None:
+                if index >= len(temp_data):
+                    logger.warning("Cannot set list index out of range for path: %s", _join_path(parts))
+                    return None
+                key = index
+            elif not isinstance(temp_data, dict):
+                logger.warning("Invalid path traversal: segment '%s' is not a container in path '%s'", key, _join_path(parts))
+                return None
+
             if i == len(parts) - 1:
-                if isinstance(temp_data, dict):
-                    temp_data[part] = value
-                elif isinstance(temp_data, list) and part.isdigit():
-                    idx = int(part)
-                    if 0 <= idx < len(temp_data):
-                        temp_data[idx] = value
-                    else:
-                        logger.warning(f"Cannot set list index out of range for path: {path}")
-                        return False
-                else:
-                    logger.warning(f"Cannot set value on non-container at path segment: {path}")
-                    return False
+                temp_data[key] = value
             else:
-                if isinstance(temp_data, dict):
-                    if part not in temp_data or not isinstance(temp_data[part], (dict, list)):
-                        temp_data[part] = {}
-                    temp_data = temp_data[part]
-                elif isinstance(temp_data, list) and part.isdigit():
-                    idx = int(part)
-                    if 0 <= idx < len(temp_data):
-                        if not isinstance(temp_data[idx], (dict, list)):
-                            temp_data[idx] = {}
-                        temp_data = temp_data[idx]
-                    else:
-                        logger.warning(f"Cannot traverse list index out of range for path: {path}")
-                        return False
-                else:
-                    logger.warning(f"Invalid path traversal: segment '{part}' is not a container in path '{path}'")
-                    return False
-        return True
+                child = temp_data[key] if isinstance(temp_data, list) else temp_data.get(key)
+                child = self._copy_container(child, owned)
+                if child is None:
+                    child = {}
+                temp_data[key] = child
+                temp_data = child
+        return new_root
+
+    @staticmethod
+    def _copy_container(node: Any, owned: Optional[Dict[int, Any]] = None) -> Any:
+        if owned is not None and id(node) in owned:
+            return node
+        if isinstance(node, dict):
+            node = node.copy()
+        elif isinstance(node, list):
+            node = list(node)
+        else:
+            return None
+        if owned is not None:
+            owned[id(node)] = node
+        return node
 
-    async def dispatch(self, action: Dict[str, Any]):
+    def dispatch(self, action: Dict[str, Any]) -> asyncio.Future:
+        """
+        Queues an action without suspending the caller. The returned future is
+        already done unless the action queue is bounded and full, in which case
+        it completes once the action has been queued. Awaiting it is optional;
+        actions are queued in dispatch order either way.
+
+        Must be called from a running event loop; otherwise RuntimeError is
+        raised before the action is queued.
+        """
+        loop = asyncio.get_running_loop()
+
+        queued = None
+        if self._pending_put is None or self._pending_put.done():
+            dispatched = self._dispatched_future(loop)
+            try:
+                self._action_queue.put_nowait(action)
+                queued = dispatched
+            except asyncio.QueueFull:
+                pass
+
+        if queued is None:
+            # Later dispatches must not overtake this one, so they are chained
+            # behind it until it has been queued.
+            queued = self._pending_put = loop.create_task(self._put_in_order(action, after=self._pending_put))
+
+        logger.debug("Action dispatched: %s", action['type'])
+        return queued
+
+    async def _put_in_order(self, action: Dict[str, Any], after: Optional[asyncio.Future]):
+        if after is not None:
+            await asyncio.wait([after])
         await self._action_queue.put(action)
-        logger.debug(f"Action dispatched: {action['type']}")
+
+    def _dispatched_future(self, loop: asyncio.AbstractEventLoop) -> asyncio.Future:
+        if self._dispatched is None or self._dispatched.get_loop() is not loop:
+            self._dispatched = loop.create_future()
+            self._dispatched.set_result(None)
+        return self._dispatched
 
     def subscribe_events(self) -> asyncio.Queue:
+        """
+        Returns the queue change events are published on: StateChangedEvents,
+        or StateChangedBatchEvents under a collecting flush policy. An event
+        carries the `path` that was set, its `old_value` and `new_value`, and
+        the action that caused it as `action_source`, a read-only view of the
+        dispatched dict (so listeners cannot alter it, and no copy is made).
+        """
         return self._event_queue
 
-    def get_current_state(self) -> Dict[str, Any]:
-        return copy.deepcopy(self._state)
+    def get_state_value(self, path: str, copy: bool = False) -> Any:
+        """
+        Returns the value at a dotted path of the current state, or None if the
+        path does not exist. As with get_current_state, containers are the live,
+        read-only objects unless `copy` is set. Lookups are cached per path until
+        a SET_STATE touches that path, one of its ancestors or something below it.
+        """
+        try:
+            value = self._path_index[path]
+        except KeyError:
+            # Parsed outside _split_path's cache, which is kept for action paths
+            parts = _parse_path(path)
+            value = self._get_nested_value(parts, current_data=self._state)
+            self._index_path(path, parts, value)
+        return self._copy_value(value) if copy else value
+
+    def get_current_state(self, copy: bool = False) -> Dict[str, Any]:
+        """
+        Returns the live current state, which callers must treat as read-only.
+        It is safe to hold on to: the processor never modifies a state it has
+        published, it replaces it.
+
+        With `copy=True` a CopyOnWriteDict is returned instead; nothing is
+        copied up front, and changes made to it stay private to it. A store
+        created with `copy_on_write=False` returns a plain deep copy instead,
+        made by a JSON round trip while the state is known to be strict JSON and
+        by copy.deepcopy otherwise.
+        """
+        if copy:
+            return self._copy_value(self._state)
+        return self._state
+
+    def get_current_state_snapshot(self) -> Mapping[str, Any]:
+        """
+        Returns the current state flattened into a read-only {dotted path: leaf
+        value} mapping, using the same paths SET_STATE accepts (list items by
+        index). It is built in a single pass: leaves are shared rather than copied, and empty dicts and
+        lists come back as new empty containers. Keys containing '.' cannot be
+        told apart from nesting.
+        """
+        snapshot: Dict[str, Any] = {}
+        stack: List[Tuple[Optional[str], Any]] = [(None, self._state)]
+        while stack:
+            path, node = stack.pop()
+            if isinstance(node, dict):
+                children = [(str(key), child) for key, child in node.items()]
+            elif isinstance(node, list):
+                children = [(str(index), child) for index, child in enumerate(node)]
+            else:
+                if path is not None:
+                    snapshot[path] = node
+                continue
+
+            if path is None:
+                prefix = ''
+            elif children:
+                prefix = path + '.'
+            else:
+                snapshot[path] = {} if isinstance(node, dict) else []
+                continue
+            # Pushed in reverse so the snapshot keeps the state's key order
+            stack.extend((prefix + key, child) for key, child in reversed(children))
+        return MappingProxyType(snapshot)
+
+    def _copy_value(self, value: Any) -> Any:
+        if self._copy_on_write:
+            return _cow_wrap(value)
+        if isinstance(value, (dict, list)):
+            return _fast_clone(value) if self._json_clone_safe else copy.deepcopy(value)
+        return value
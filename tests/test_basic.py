@@ -2,7 +2,10 @@
 import asyncio
 import copy
 import json
+import math
+import pickle
 import pytest
+import uuid
 
 from roz_remembers import RozRemembers
 
@@ -132,6 +135,431 @@ async def test_complex_state(tmp_path):
     await store.stop_processing()
     print(f"\nTest 'test_gameworld_lifecycle' completed. Final state:\n{json.dumps(store.get_current_state(), indent=2)}")
 
+@pytest.mark.asyncio
+async def test_set_state_shares_untouched_subtrees(tmp_path):
+    """
+    Tests that a SET_STATE only copies the containers along its path and leaves
+    the previous state tree untouched.
+    """
+    initial_state_file = tmp_path / "gameworld_state.json"
+    with open(initial_state_file, 'w') as f:
+        json.dump(INITIAL_STATES["GAMEWORLD"], f, indent=2)
+
+    store = RozRemembers(initial_state_file_path=str(initial_state_file))
+    await store.load_initial_state()
+    store.start_processing()
+
+    previous_state = store._state
+    await store.dispatch({
+        "type": store.ACTION_TYPE_SET_STATE,
+        "path": "characters.char_hero.health",
+        "value": 90
+    })
+    await asyncio.sleep(0.05)
+
+    # Only the path to the leaf is copied; sibling subtrees are shared
+    assert store._state is not previous_state
+    assert store._state["rooms"] is previous_state["rooms"]
+    assert store._state["characters"]["char_hero"]["health"] == 90
+    assert previous_state["characters"]["char_hero"]["health"] == 100
+
+    await store.stop_processing()
+
+@pytest.mark.asyncio
+async def test_current_state_writes_stay_private(tmp_path):
+    """
+    Tests that writing to the object returned by get_current_state(copy=True)
+    does not leak back into the store's state.
+    """
+    initial_state = dict(INITIAL_STATES["GAMEWORLD"], inventory=[{"name": "torch"}])
+    initial_state_file = tmp_path / "gameworld_state.json"
+    with open(initial_state_file, 'w') as f:
+        json.dump(initial_state, f, indent=2)
+
+    store = RozRemembers(initial_state_file_path=str(initial_state_file))
+    await store.load_initial_state()
+
+    state = store.get_current_state(copy=True)
+    state["characters"]["char_hero"]["health"] = 0
+    state["rooms"]["room_start"]["exits"].clear()
+    del state["players"]
+    (state["inventory"] + [])[0]["name"] = "lantern"
+    ([] + state["inventory"])[0]["name"] = "lantern"
+    (state["inventory"] * 2)[1]["name"] = "lantern"
+    (2 * state["inventory"])[1]["name"] = "lantern"
+    (state | {})["rooms"]["room_start"]["name"] = "Ruins"
+    ({} | state)["rooms"]["room_start"]["name"] = "Ruins"
+
+    assert state["characters"]["char_hero"]["health"] == 0
+    assert store.get_current_state() == initial_state
+
+    hero = store.get_state_value("characters.char_hero", copy=True)
+    hero["name"] = "Zero"
+    assert store.get_state_value("characters.char_hero.name") == "Hero"
+
+@pytest.mark.asyncio
+async def test_burst_of_actions(tmp_path):
+    """
+    Tests that a burst of queued actions is applied in order, with one
+    STATE_CHANGED event per applied action.
+    """
+    initial_state_file = tmp_path / "gameworld_state.json"
+    with open(initial_state_file, 'w') as f:
+        json.dump(INITIAL_STATES["GAMEWORLD"], f, indent=2)
+
+    store = RozRemembers(initial_state_file_path=str(initial_state_file), max_batch=3)
+    await store.load_initial_state()
+    events = store.subscribe_events()
+
+    for health in (90, 80, 70, 60):
+        await store.dispatch({
+            "type": store.ACTION_TYPE_SET_STATE,
+            "path": "characters.char_hero.health",
+            "value": health
+        })
+    await store.dispatch({"type": "UNKNOWN"})
+    await store.dispatch({
+        "type": store.ACTION_TYPE_SET_STATE,
+        "path": "characters.char_hero.current_room_id",
+        "value": "room_forest"
+    })
+
+    store.start_processing()
+    await asyncio.sleep(0.05)
+
+    updated_state = store.get_current_state()
+    assert updated_state["characters"]["char_hero"]["health"] == 60
+    assert updated_state["characters"]["char_hero"]["current_room_id"] == "room_forest"
+
+    emitted = [events.get_nowait() for _ in range(events.qsize())]
+    assert [(e.old_value, e.new_value) for e in emitted[:4]] == [
+        (100, 90), (90, 80), (80, 70), (70, 60)
+    ]
+    assert emitted[4].path == "characters.char_hero.current_room_id"
+    with pytest.raises(TypeError):
+        emitted[0].action_source["value"] = 0
+
+    event_copy = copy.deepcopy(emitted[0])
+    assert event_copy == emitted[0]
+    assert event_copy.action_source is not emitted[0].action_source
+    with pytest.raises(TypeError):
+        event_copy.action_source["value"] = 0
+    assert len(emitted) == 5
+
+    await store.stop_processing()
+
+@pytest.mark.asyncio
+async def test_numeric_path_segments(tmp_path):
+    """
+    Tests that numeric path segments index into lists but are plain keys for
+    dicts.
+    """
+    initial_state_file = tmp_path / "numeric_state.json"
+    with open(initial_state_file, 'w') as f:
+        json.dump({
+            "inventory": [{"name": "torch"}, {"name": "rope"}],
+            "scores": {"1": 10}
+        }, f, indent=2)
+
+    store = RozRemembers(initial_state_file_path=str(initial_state_file))
+    await store.load_initial_state()
+    store.start_processing()
+
+    for path, value in (("inventory.1.name", "lantern"), ("scores.1", 20), ("inventory.5", "sword")):
+        await store.dispatch({
+            "type": store.ACTION_TYPE_SET_STATE,
+            "path": path,
+            "value": value
+        })
+    await asyncio.sleep(0.05)
+
+    assert store.get_current_state() == {
+        "inventory": [{"name": "torch"}, {"name": "lantern"}],
+        "scores": {"1": 20}
+    }
+
+    await store.stop_processing()
+
+@pytest.mark.asyncio
+async def test_get_state_value(tmp_path):
+    """
+    Tests that cached path lookups follow writes to the path itself, to its
+    ancestors and to paths below it, however list indices are spelled.
+    """
+    initial_state_file = tmp_path / "gameworld_state.json"
+    with open(initial_state_file, 'w') as f:
+        json.dump(dict(INITIAL_STATES["GAMEWORLD"], inventory=[{"name": "torch"}, {"name": "rope"}]), f, indent=2)
+
+    store = RozRemembers(initial_state_file_path=str(initial_state_file))
+    await store.load_initial_state()
+    store.start_processing()
+
+    assert store.get_state_value("characters.char_hero.health") == 100
+    assert store.get_state_value("characters.char_hero")["name"] == "Hero"
+    snapshot = store.get_current_state()
+    assert store.get_state_value("rooms.room_start.name") == "Starting Area"
+    assert store.get_state_value("characters.char_villain") is None
+    assert store.get_state_value("inventory.01.name") == "rope"
+
+    for path, value in (
+        ("characters.char_hero.health", 50),
+        ("characters.char_villain", {"name": "Villain"}),
+        ("rooms.room_start", {"name": "Ruins"}),
+        ("inventory.1.name", "lantern"),
+    ):
+        await store.dispatch({
+            "type": store.ACTION_TYPE_SET_STATE,
+            "path": path,
+            "value": value
+        })
+    await asyncio.sleep(0.05)
+
+    assert store.get_state_value("characters.char_hero.health") == 50
+    assert store.get_state_value("characters.char_hero")["health"] == 50
+    assert store.get_state_value("characters.char_villain") == {"name": "Villain"}
+    assert store.get_state_value("rooms.room_start.name") == "Ruins"
+    assert store.get_state_value("inventory.01.name") == "lantern"
+    # A previously returned live state is left as it was
+    assert snapshot["characters"]["char_hero"]["health"] == 100
+
+    await store.stop_processing()
+
+@pytest.mark.asyncio
+async def test_current_state_plain_copies(tmp_path):
+    """
+    Tests that a store with copy-on-write disabled hands out plain, fully
+    independent copies.
+    """
+    initial_state_file = tmp_path / "gameworld_state.json"
+    with open(initial_state_file, 'w') as f:
+        json.dump(INITIAL_STATES["GAMEWORLD"], f, indent=2)
+
+    store = RozRemembers(initial_state_file_path=str(initial_state_file), copy_on_write=False)
+    await store.load_initial_state()
+
+    state = store.get_current_state(copy=True)
+    assert type(state) is dict
+    assert state == INITIAL_STATES["GAMEWORLD"]
+
+    state["characters"]["char_hero"]["health"] = 0
+    store.get_state_value("rooms.room_start.exits", copy=True).clear()
+    assert store.get_current_state() == INITIAL_STATES["GAMEWORLD"]
+
+@pytest.mark.asyncio
+async def test_bounded_action_queue(tmp_path):
+    """
+    Tests that dispatch waits for room in a bounded action queue instead of
+    dropping actions.
+    """
+    initial_state_file = tmp_path / "basic_state.json"
+    with open(initial_state_file, 'w') as f:
+        json.dump(INITIAL_STATES["BASIC"], f, indent=2)
+
+    store = RozRemembers(initial_state_file_path=str(initial_state_file), action_queue_maxsize=2)
+    await store.load_initial_state()
+    store.start_processing()
+
+    for version in range(10):
+        await store.dispatch({
+            "type": store.ACTION_TYPE_SET_STATE,
+            "path": "app_version",
+            "value": f"1.0.{version}"
+        })
+    await asyncio.sleep(0.05)
+
+    assert store.get_current_state()["app_version"] == "1.0.9"
+    assert store.subscribe_events().qsize() == 10
+
+    await store.stop_processing()
+
+@pytest.mark.asyncio
+async def test_dispatch_without_await(tmp_path):
+    """
+    Tests that actions dispatched without awaiting keep their order, even when
+    a bounded action queue is full.
+    """
+    initial_state_file = tmp_path / "basic_state.json"
+    with open(initial_state_file, 'w') as f:
+        json.dump(INITIAL_STATES["BASIC"], f, indent=2)
+
+    store = RozRemembers(initial_state_file_path=str(initial_state_file), action_queue_maxsize=2)
+    await store.load_initial_state()
+    store.start_processing()
+
+    for version in range(10):
+        store.dispatch({
+            "type": store.ACTION_TYPE_SET_STATE,
+            "path": "app_version",
+            "value": f"1.0.{version}"
+        })
+    await asyncio.sleep(0.05)
+
+    assert store.get_current_state()["app_version"] == "1.0.9"
+    events = store.subscribe_events()
+    emitted = [events.get_nowait().new_value for _ in range(events.qsize())]
+    assert emitted == [f"1.0.{version}" for version in range(10)]
+
+    await store.stop_processing()
+
+@pytest.mark.asyncio
+async def test_event_flush_timer(tmp_path):
+    """
+    Tests that the timer flush policy collects the changes made between
+    flushes into a single STATE_CHANGED_BATCH event.
+    """
+    initial_state_file = tmp_path / "basic_state.json"
+    with open(initial_state_file, 'w') as f:
+        json.dump(INITIAL_STATES["BASIC"], f, indent=2)
+
+    store = RozRemembers(
+        initial_state_file_path=str(initial_state_file),
+        event_flush_policy=RozRemembers.EVENT_FLUSH_TIMER,
+        event_flush_delay=0.2
+    )
+    await store.load_initial_state()
+    store.start_processing()
+    events = store.subscribe_events()
+
+    for theme in ("light", "solarized", "dark"):
+        await store.dispatch({
+            "type": store.ACTION_TYPE_SET_STATE,
+            "path": "user_settings.theme",
+            "value": theme
+        })
+        await asyncio.sleep(0.01)
+    assert events.empty()
+
+    event = await asyncio.wait_for(events.get(), timeout=1)
+    assert event.type == store.EVENT_TYPE_STATE_CHANGED_BATCH
+    assert [e.new_value for e in event.events] == ["light", "solarized", "dark"]
+
+    for published in (event, event.events[0]):
+        assert copy.copy(published) == published
+        assert pickle.loads(pickle.dumps(published)) == published
+
+    await store.dispatch({
+        "type": store.ACTION_TYPE_SET_STATE,
+        "path": "app_version",
+        "value": "1.0.1"
+    })
+    await asyncio.sleep(0.01)
+    # Stopping publishes whatever is still waiting for the timer
+    await store.stop_processing()
+    event = events.get_nowait()
+    assert [e.path for e in event.events] == ["app_version"]
+
+@pytest.mark.asyncio
+async def test_current_state_snapshot(tmp_path):
+    """
+    Tests that the snapshot flattens the state into SET_STATE paths and is
+    read-only.
+    """
+    initial_state_file = tmp_path / "snapshot_state.json"
+    with open(initial_state_file, 'w') as f:
+        json.dump({
+            "app_version": "1.0.0",
+            "user_settings": {"theme": "dark", "shortcuts": {}},
+            "inventory": [{"name": "torch"}, None, []]
+        }, f, indent=2)
+
+    store = RozRemembers(initial_state_file_path=str(initial_state_file))
+    await store.load_initial_state()
+
+    snapshot = store.get_current_state_snapshot()
+    assert list(snapshot.items()) == [
+        ("app_version", "1.0.0"),
+        ("user_settings.theme", "dark"),
+        ("user_settings.shortcuts", {}),
+        ("inventory.0.name", "torch"),
+        ("inventory.1", None),
+        ("inventory.2", []),
+    ]
+    assert snapshot["user_settings.shortcuts"] is not store.get_current_state()["user_settings"]["shortcuts"]
+    with pytest.raises(TypeError):
+        snapshot["app_version"] = "2.0.0"
+
+@pytest.mark.asyncio
+async def test_plain_copies_keep_non_finite_floats(tmp_path):
+    """
+    Tests that NaN and Infinity survive both loading and plain copies, whether
+    they come from the state file or from a SET_STATE.
+    """
+    initial_state_file = tmp_path / "nan_state.json"
+    with open(initial_state_file, 'w') as f:
+        f.write('{"x": NaN, "nested": {"y": [Infinity]}}')
+
+    store = RozRemembers(initial_state_file_path=str(initial_state_file), copy_on_write=False)
+    await store.load_initial_state()
+
+    assert math.isnan(store.get_current_state()["x"])
+    state = store.get_current_state(copy=True)
+    assert math.isnan(state["x"])
+    assert state["nested"]["y"] == [math.inf]
+    assert store.get_state_value("nested", copy=True) == {"y": [math.inf]}
+
+    initial_state_file = tmp_path / "basic_state.json"
+    with open(initial_state_file, 'w') as f:
+        json.dump(INITIAL_STATES["BASIC"], f, indent=2)
+
+    store = RozRemembers(initial_state_file_path=str(initial_state_file), copy_on_write=False)
+    await store.load_initial_state()
+    store.start_processing()
+
+    await store.dispatch({
+        "type": store.ACTION_TYPE_SET_STATE,
+        "path": "user_settings.scale",
+        "value": {"factor": -math.inf}
+    })
+    await asyncio.sleep(0.05)
+
+    assert store.get_current_state(copy=True)["user_settings"]["scale"] == {"factor": -math.inf}
+
+    await store.stop_processing()
+
+@pytest.mark.asyncio
+async def test_plain_copies_keep_non_json_types(tmp_path):
+    """
+    Tests that plain copies keep values JSON has no exact form for, such as
+    tuples and UUIDs, instead of handing back lists and strings.
+    """
+    initial_state_file = tmp_path / "basic_state.json"
+    with open(initial_state_file, 'w') as f:
+        json.dump(INITIAL_STATES["BASIC"], f, indent=2)
+
+    store = RozRemembers(initial_state_file_path=str(initial_state_file), copy_on_write=False)
+    await store.load_initial_state()
+    store.start_processing()
+
+    session_id = uuid.uuid4()
+    await store.dispatch({
+        "type": store.ACTION_TYPE_SET_STATE,
+        "path": "user_settings.session",
+        "value": {"id": session_id, "window": (800, 600)}
+    })
+    await asyncio.sleep(0.05)
+
+    session = store.get_current_state(copy=True)["user_settings"]["session"]
+    assert session["id"] == session_id and isinstance(session["id"], uuid.UUID)
+    assert session["window"] == (800, 600)
+    assert store.get_state_value("user_settings.session.window", copy=True) == (800, 600)
+
+    await store.stop_processing()
+
+def test_dispatch_without_running_loop():
+    """
+    Tests that dispatching outside a running event loop fails without queuing
+    the action.
+    """
+    store = RozRemembers(initial_state_file_path="unused.json")
+
+    with pytest.raises(RuntimeError):
+        store.dispatch({
+            "type": store.ACTION_TYPE_SET_STATE,
+            "path": "app_version",
+            "value": "1.0.1"
+        })
+    assert store._action_queue.empty()
+
 # To run these tests:
 # 1. Save the above code as a Python file, e.g., `test_rozremembers.py`.
 # 2. Make sure you have pytest installed: `pip install pytest pytest-asyncio`